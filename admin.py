@@ -0,0 +1,39 @@
+import os
+import secrets
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query
+from diagnostico import DIAGNOSTICO_ACTIVO, registro_consultas
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+def verificar_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    # Sin ADMIN_TOKEN configurado los endpoints de administración quedan cerrados
+    if not ADMIN_TOKEN or not x_admin_token or not secrets.compare_digest(
+        x_admin_token.encode(), ADMIN_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Token de administrador inválido"
+        )
+
+
+@router.get("/slow-queries", summary="Consultas lentas registradas", dependencies=[Depends(verificar_admin)])
+def get_slow_queries(
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Número máximo de consultas a devolver")
+) -> Dict[str, Any]:
+    consultas: List[Dict[str, Any]] = registro_consultas.get_top(limit)
+    return {
+        "diagnostico_activo": DIAGNOSTICO_ACTIVO,
+        "umbral_ms": registro_consultas.umbral_ms,
+        "muestreo_explain": registro_consultas.muestreo_explain,
+        "total": len(consultas),
+        "consultas": consultas
+    }
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT, summary="Vaciar consultas lentas", dependencies=[Depends(verificar_admin)])
+def clear_slow_queries():
+    registro_consultas.limpiar()
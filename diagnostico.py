@@ -0,0 +1,150 @@
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DIAGNOSTICO_ACTIVO = os.getenv("DB_DIAGNOSTICO", "false").lower() in ("1", "true", "yes")
+UMBRAL_LENTO_MS = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+EXPLAIN_MUESTREO = float(os.getenv("DB_EXPLAIN_SAMPLE_RATE", "0"))
+MAX_CONSULTAS_LENTAS = int(os.getenv("DB_SLOW_QUERY_TOP_N", "50"))
+
+# Guarda el scope ASGI de la petición: el router agrega "route" al mismo dict al resolverla
+scope_actual: ContextVar[Optional[Dict[str, Any]]] = ContextVar("scope_actual", default=None)
+
+
+class RegistroRutaMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = scope_actual.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            scope_actual.reset(token)
+
+
+def get_ruta_actual() -> Optional[str]:
+    scope = scope_actual.get()
+    if scope is None:
+        return None
+    ruta = getattr(scope.get("route"), "path", scope.get("path"))
+    return f"{scope.get('method')} {ruta}"
+
+
+class RegistroConsultasLentas:
+    def __init__(self, umbral_ms: float, muestreo_explain: float, max_registros: int):
+        self.umbral_ms = umbral_ms
+        self.muestreo_explain = muestreo_explain
+        self.max_registros = max(max_registros, 1)
+        # Min-heap por duración: la raíz es la consulta más rápida conservada
+        self._consultas: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._contador = itertools.count()
+        self._lock = threading.Lock()
+
+    def entra_en_top(self, duracion_ms: float) -> bool:
+        with self._lock:
+            return (len(self._consultas) < self.max_registros
+                    or duracion_ms > self._consultas[0][0])
+
+    def registrar(self, consulta: Dict[str, Any]) -> None:
+        entrada = (consulta["duracion_ms"], next(self._contador), consulta)
+        with self._lock:
+            if len(self._consultas) < self.max_registros:
+                heapq.heappush(self._consultas, entrada)
+            elif entrada[0] > self._consultas[0][0]:
+                heapq.heapreplace(self._consultas, entrada)
+
+    def get_top(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            entradas = heapq.nlargest(limit or len(self._consultas), self._consultas)
+        return [consulta for _, _, consulta in entradas]
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._consultas.clear()
+
+    def debe_explicar(self, statement: str, dialecto: str) -> bool:
+        # EXPLAIN ANALYZE ejecuta la sentencia: solo se permite sobre SELECT
+        if dialecto != "postgresql" or self.muestreo_explain <= 0:
+            return False
+        if not statement.lstrip().upper().startswith("SELECT"):
+            return False
+        return random.random() < self.muestreo_explain
+
+
+registro_consultas = RegistroConsultasLentas(
+    umbral_ms=UMBRAL_LENTO_MS,
+    muestreo_explain=EXPLAIN_MUESTREO,
+    max_registros=MAX_CONSULTAS_LENTAS
+)
+
+
+def _ejecutar_explain(cursor, statement: str, parameters) -> List[str]:
+    # EXPLAIN ANALYZE vuelve a ejecutar la sentencia: siempre se deshace hasta el SAVEPOINT
+    # para que solo salga el texto del plan y un fallo no aborte la transacción en curso
+    cursor.execute("SAVEPOINT diagnostico_explain")
+    try:
+        cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+        return [fila[0] for fila in cursor.fetchall()]
+    finally:
+        cursor.execute("ROLLBACK TO SAVEPOINT diagnostico_explain")
+        cursor.execute("RELEASE SAVEPOINT diagnostico_explain")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("diagnostico_inicio", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    inicios = conn.info.get("diagnostico_inicio")
+    if not inicios:
+        return
+    duracion_ms = (time.perf_counter() - inicios.pop()) * 1000
+    if duracion_ms < registro_consultas.umbral_ms or not registro_consultas.entra_en_top(duracion_ms):
+        return
+
+    consulta = {
+        "statement": statement,
+        "parametros": repr(parameters),
+        "duracion_ms": round(duracion_ms, 3),
+        "ruta": get_ruta_actual(),
+        "fecha": datetime.now().isoformat(),
+        "plan": None,
+    }
+
+    if not executemany and registro_consultas.debe_explicar(statement, conn.dialect.name):
+        explain_cursor = conn.connection.cursor()
+        try:
+            consulta["plan"] = _ejecutar_explain(explain_cursor, statement, parameters)
+        except Exception as e:
+            consulta["plan"] = [f"EXPLAIN falló: {e}"]
+        finally:
+            explain_cursor.close()
+
+    registro_consultas.registrar(consulta)
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("diagnostico_inicio"):
+        conn.info["diagnostico_inicio"].pop()
+
+
+def instalar_diagnostico(engine: Engine) -> None:
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
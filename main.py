@@ -1,8 +1,21 @@
-from fastapi import FastAPI
+import time
+
+# Se toma al cargar la aplicación, antes del resto de imports; no incluye el arranque del intérprete
+INICIO_CARGA = time.perf_counter()
+
+import logging
+import os
+from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
-from database import create_db_and_tables
+from fastapi.responses import JSONResponse
+from database import calentar_pool
+from migraciones import VERSION_ESQUEMA, EsquemaDesactualizado, verificar_version_esquema
 from autos import router as autos_router
 from ventas import router as ventas_router
+from admin import router as admin_router
+from diagnostico import DIAGNOSTICO_ACTIVO, RegistroRutaMiddleware
+
+logger = logging.getLogger("uvicorn.error")
 
 app = FastAPI(
     title="API de Ventas de Autos",
@@ -38,13 +51,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if DIAGNOSTICO_ACTIVO:
+    app.add_middleware(RegistroRutaMiddleware)
+
 app.include_router(autos_router)
 app.include_router(ventas_router)
+app.include_router(admin_router)
 
 
 @app.on_event("startup")
 def on_startup():
-    create_db_and_tables()
+    verificar_version_esquema()
+    calentar_pool()
+
+    # Para un worker reiniciado por el gestor de procesos solo es significativa su propia carga
+    mensaje = f"Worker {os.getpid()} listo en {time.perf_counter() - INICIO_CARGA:.2f}s desde la carga de la aplicación"
+    inicio_lanzador = os.getenv("LANZADOR_INICIO")
+    if inicio_lanzador:
+        mensaje += f" ({time.time() - float(inicio_lanzador):.2f}s desde el lanzamiento)"
+    logger.info(mensaje)
 
 
 @app.get("/", tags=["root"], summary="Endpoint raíz")
@@ -62,9 +87,52 @@ def read_root():
 
 
 @app.get("/health", tags=["health"], summary="Health check")
+@app.get("/health/live", tags=["health"], summary="Liveness check")
 def health_check():
     return {
         "status": "healthy",
         "service": "API de Ventas de Autos"
     }
 
+
+_ultimo_motivo_readiness = None
+
+
+@app.get("/health/ready", tags=["health"], summary="Readiness check")
+def readiness_check():
+    global _ultimo_motivo_readiness
+
+    motivo = None
+    try:
+        # Las sondas se repiten cada pocos segundos: sin aviso de esquema más nuevo ni traceback
+        verificar_version_esquema(avisar_si_mas_nuevo=False)
+    except EsquemaDesactualizado as e:
+        motivo = "schema"
+        error = e
+    except Exception as e:
+        motivo = "database"
+        error = e
+
+    # Solo se registra cuando cambia el estado, para no inundar el log durante una caída
+    if motivo != _ultimo_motivo_readiness:
+        if motivo:
+            logger.warning(f"Readiness: no disponible ({motivo}): {error}", exc_info=False)
+        else:
+            logger.info("Readiness: servicio disponible nuevamente")
+        _ultimo_motivo_readiness = motivo
+
+    if motivo:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={
+                "status": "unavailable",
+                "service": "API de Ventas de Autos",
+                "detail": motivo
+            }
+        )
+    return {
+        "status": "ready",
+        "service": "API de Ventas de Autos",
+        "schema_version": VERSION_ESQUEMA
+    }
+
@@ -0,0 +1,117 @@
+import logging
+from typing import Callable, List, Optional, Tuple
+from sqlalchemy import (
+    Column, DateTime, Float, ForeignKey, Index, Integer, MetaData, String, Table,
+    func, select, text
+)
+from sqlalchemy.engine import Connection, Engine
+from database import engine
+
+logger = logging.getLogger(__name__)
+
+BLOQUEO_MIGRACIONES = 417451
+
+metadata_version = MetaData()
+
+schema_version = Table(
+    "schema_version",
+    metadata_version,
+    Column("version", Integer, primary_key=True),
+    Column("descripcion", String, nullable=False),
+    Column("aplicada_en", DateTime, nullable=False, server_default=func.now()),
+)
+
+
+class EsquemaDesactualizado(RuntimeError):
+    pass
+
+
+# Esquema de la versión 1 congelado: no debe cambiar aunque cambien los modelos
+metadata_v1 = MetaData()
+
+Table(
+    "auto",
+    metadata_v1,
+    Column("id", Integer, primary_key=True),
+    Column("marca", String, nullable=False),
+    Column("modelo", String, nullable=False),
+    Column("año", Integer, nullable=False),
+    Column("numero_chasis", String, nullable=False),
+    Index("ix_auto_numero_chasis", "numero_chasis", unique=True),
+)
+
+Table(
+    "venta",
+    metadata_v1,
+    Column("id", Integer, primary_key=True),
+    Column("nombre_comprador", String, nullable=False),
+    Column("precio", Float, nullable=False),
+    Column("fecha_venta", DateTime, nullable=False),
+    Column("auto_id", Integer, ForeignKey("auto.id"), nullable=False),
+)
+
+
+def _crear_tablas_iniciales(conn: Connection) -> None:
+    # checkfirst permite adoptar bases creadas con el antiguo create_all
+    metadata_v1.create_all(conn, checkfirst=True)
+
+
+MIGRACIONES: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "Tablas auto y venta", _crear_tablas_iniciales),
+]
+
+VERSION_ESQUEMA = MIGRACIONES[-1][0]
+
+
+def get_version_actual(conn: Connection) -> Optional[int]:
+    if not conn.dialect.has_table(conn, schema_version.name):
+        return None
+    return conn.execute(select(func.max(schema_version.c.version))).scalar()
+
+
+def aplicar_migraciones(motor: Engine = engine) -> List[int]:
+    aplicadas = []
+    with motor.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            # Serializa migraciones lanzadas en paralelo desde varios hosts
+            conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": BLOQUEO_MIGRACIONES})
+
+        metadata_version.create_all(conn)
+        version_actual = get_version_actual(conn) or 0
+
+        for version, descripcion, migracion in MIGRACIONES:
+            if version <= version_actual:
+                continue
+            migracion(conn)
+            conn.execute(schema_version.insert().values(version=version, descripcion=descripcion))
+            aplicadas.append(version)
+    return aplicadas
+
+
+def ejecutar_migraciones(motor: Engine = engine) -> List[int]:
+    aplicadas = aplicar_migraciones(motor)
+    if aplicadas:
+        print(f"Migraciones aplicadas: {', '.join(str(v) for v in aplicadas)}")
+    else:
+        print(f"El esquema ya está en la versión {VERSION_ESQUEMA}")
+    return aplicadas
+
+
+def verificar_version_esquema(motor: Engine = engine, avisar_si_mas_nuevo: bool = True) -> None:
+    with motor.connect() as conn:
+        version_actual = get_version_actual(conn)
+    # Un esquema más nuevo es válido: durante un despliegue se migra antes de renovar los workers
+    if version_actual is None or version_actual < VERSION_ESQUEMA:
+        raise EsquemaDesactualizado(
+            f"Versión de esquema {version_actual}, se esperaba {VERSION_ESQUEMA}. "
+            "Ejecutar 'python migraciones.py' antes de iniciar la API."
+        )
+    if avisar_si_mas_nuevo and version_actual > VERSION_ESQUEMA:
+        logger.warning(
+            f"La base de datos está en la versión de esquema {version_actual}, "
+            f"más nueva que la esperada ({VERSION_ESQUEMA})"
+        )
+
+
+if __name__ == "__main__":
+    ejecutar_migraciones()
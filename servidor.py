@@ -0,0 +1,86 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Lanzador de producción de la API de Ventas de Autos")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count())),
+        help="Número de procesos worker"
+    )
+    parser.add_argument(
+        "--servidor",
+        choices=["uvicorn", "gunicorn"],
+        default="uvicorn",
+        help="Gestor de procesos a utilizar"
+    )
+    parser.add_argument(
+        "--migrar",
+        action="store_true",
+        help="Aplicar migraciones pendientes antes de lanzar los workers"
+    )
+    return parser.parse_args()
+
+
+def run_uvicorn(args: argparse.Namespace) -> None:
+    import uvicorn
+
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        # uvloop no está disponible en Windows
+        loop="uvloop" if sys.platform != "win32" else "auto",
+        http="httptools",
+        access_log=False
+    )
+
+
+def run_gunicorn(args: argparse.Namespace) -> None:
+    try:
+        from gunicorn.app.base import BaseApplication
+        import uvicorn_worker  # noqa: F401
+    except ImportError:
+        raise SystemExit("gunicorn no está instalado: pip install gunicorn uvicorn-worker")
+
+    class Aplicacion(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", f"{args.host}:{args.port}")
+            self.cfg.set("workers", args.workers)
+            # UvicornWorker usa uvloop y httptools cuando están instalados
+            self.cfg.set("worker_class", "uvicorn_worker.UvicornWorker")
+            self.cfg.set("accesslog", None)
+
+        def load(self):
+            from main import app
+            return app
+
+    Aplicacion().run()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    if args.migrar:
+        from database import engine
+        from migraciones import ejecutar_migraciones
+
+        ejecutar_migraciones()
+        # Los workers de gunicorn se crean con fork: no deben heredar conexiones abiertas
+        engine.dispose()
+
+    # Cada worker informa el tiempo desde la carga de la aplicación y el transcurrido desde este punto
+    os.environ["LANZADOR_INICIO"] = str(time.time())
+
+    if args.servidor == "gunicorn":
+        run_gunicorn(args)
+    else:
+        run_uvicorn(args)
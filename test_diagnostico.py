@@ -0,0 +1,112 @@
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+import admin
+from admin import verificar_admin
+from diagnostico import (
+    RegistroConsultasLentas, RegistroRutaMiddleware, instalar_diagnostico, registro_consultas
+)
+
+
+def _registro(max_registros: int = 3, muestreo_explain: float = 0) -> RegistroConsultasLentas:
+    return RegistroConsultasLentas(umbral_ms=0, muestreo_explain=muestreo_explain, max_registros=max_registros)
+
+
+def test_registro_conserva_las_mas_lentas():
+    registro = _registro()
+    for duracion in [30000, 201, 202, 203, 204, 205]:
+        registro.registrar({"duracion_ms": duracion})
+
+    assert [c["duracion_ms"] for c in registro.get_top()] == [30000, 205, 204]
+    assert [c["duracion_ms"] for c in registro.get_top(2)] == [30000, 205]
+
+
+def test_entra_en_top():
+    registro = _registro(max_registros=2)
+    assert registro.entra_en_top(1)
+
+    registro.registrar({"duracion_ms": 300})
+    registro.registrar({"duracion_ms": 400})
+
+    assert not registro.entra_en_top(300)
+    assert registro.entra_en_top(301)
+
+
+def test_max_registros_minimo_uno():
+    registro = _registro(max_registros=0)
+    registro.registrar({"duracion_ms": 100})
+    registro.registrar({"duracion_ms": 200})
+
+    assert [c["duracion_ms"] for c in registro.get_top()] == [200]
+
+
+def test_limpiar():
+    registro = _registro()
+    registro.registrar({"duracion_ms": 100})
+    registro.limpiar()
+
+    assert registro.get_top() == []
+
+
+def test_debe_explicar_solo_select_en_postgresql():
+    registro = _registro(muestreo_explain=1)
+
+    assert registro.debe_explicar("  select * from auto", "postgresql")
+    assert not registro.debe_explicar("SELECT * FROM auto", "sqlite")
+    assert not registro.debe_explicar("UPDATE auto SET marca = 'X'", "postgresql")
+    assert not registro.debe_explicar(
+        "WITH borrados AS (DELETE FROM venta RETURNING id) SELECT * FROM borrados", "postgresql"
+    )
+
+
+def test_debe_explicar_con_muestreo_cero():
+    assert not _registro(muestreo_explain=0).debe_explicar("SELECT 1", "postgresql")
+
+
+@pytest.mark.parametrize("token_configurado, token_enviado", [
+    (None, None),
+    (None, "cualquiera"),
+    ("secreto", None),
+    ("secreto", "incorrecto"),
+])
+def test_verificar_admin_rechaza(monkeypatch, token_configurado, token_enviado):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", token_configurado)
+
+    with pytest.raises(HTTPException) as error:
+        verificar_admin(token_enviado)
+    assert error.value.status_code == 403
+
+
+def test_verificar_admin_acepta_token_correcto(monkeypatch):
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "secreto")
+
+    verificar_admin("secreto")
+
+
+def test_registra_plantilla_de_ruta(monkeypatch, tmp_path):
+    monkeypatch.setattr(registro_consultas, "umbral_ms", 0)
+    registro_consultas.limpiar()
+
+    motor = create_engine(f"sqlite:///{tmp_path / 'autos.db'}")
+    instalar_diagnostico(motor)
+
+    app = FastAPI()
+    app.add_middleware(RegistroRutaMiddleware)
+
+    # Endpoint sincrónico: se ejecuta en el threadpool
+    @app.get("/autos/{auto_id}")
+    def get_auto(auto_id: int):
+        with motor.connect() as conn:
+            conn.execute(text("SELECT :id"), {"id": auto_id})
+        return {"id": auto_id}
+
+    try:
+        respuesta = TestClient(app).get("/autos/7")
+    finally:
+        motor.dispose()
+
+    assert respuesta.status_code == 200
+    rutas = {c["ruta"] for c in registro_consultas.get_top() if c["statement"] == "SELECT ?"}
+    assert rutas == {"GET /autos/{auto_id}"}
+    registro_consultas.limpiar()
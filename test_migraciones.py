@@ -0,0 +1,86 @@
+import os
+import tempfile
+
+# database.py crea el engine al importarse: se apunta a SQLite para no requerir PostgreSQL
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.gettempdir(), 'autos_test_import.db')}"
+
+import pytest
+from sqlalchemy import create_engine, inspect
+from sqlmodel import SQLModel
+import models  # noqa: F401
+from migraciones import (
+    VERSION_ESQUEMA, EsquemaDesactualizado, aplicar_migraciones,
+    get_version_actual, metadata_version, schema_version, verificar_version_esquema
+)
+
+
+@pytest.fixture
+def motor(tmp_path):
+    motor = create_engine(f"sqlite:///{tmp_path / 'autos.db'}")
+    yield motor
+    motor.dispose()
+
+
+def test_base_nueva_aplica_todas_las_migraciones(motor):
+    assert aplicar_migraciones(motor) == list(range(1, VERSION_ESQUEMA + 1))
+
+    inspector = inspect(motor)
+    assert {"auto", "venta", "schema_version"} <= set(inspector.get_table_names())
+    indices = {i["name"]: i for i in inspector.get_indexes("auto")}
+    assert indices["ix_auto_numero_chasis"]["unique"]
+
+
+def test_adopta_base_creada_con_create_all(motor):
+    SQLModel.metadata.create_all(motor)
+
+    assert aplicar_migraciones(motor) == list(range(1, VERSION_ESQUEMA + 1))
+    with motor.connect() as conn:
+        assert get_version_actual(conn) == VERSION_ESQUEMA
+
+
+def test_volver_a_ejecutar_no_aplica_nada(motor):
+    aplicar_migraciones(motor)
+
+    assert aplicar_migraciones(motor) == []
+    with motor.connect() as conn:
+        assert get_version_actual(conn) == VERSION_ESQUEMA
+
+
+def test_verificar_falla_sin_migraciones(motor):
+    with pytest.raises(EsquemaDesactualizado):
+        verificar_version_esquema(motor)
+
+
+def test_verificar_falla_con_esquema_atrasado(motor):
+    metadata_version.create_all(motor)
+    with motor.begin() as conn:
+        conn.execute(schema_version.insert().values(version=VERSION_ESQUEMA - 1, descripcion="Anterior"))
+
+    with pytest.raises(EsquemaDesactualizado):
+        verificar_version_esquema(motor)
+
+
+def test_verificar_acepta_version_actual(motor):
+    aplicar_migraciones(motor)
+
+    verificar_version_esquema(motor)
+
+
+def test_verificar_acepta_esquema_mas_nuevo(motor):
+    aplicar_migraciones(motor)
+    with motor.begin() as conn:
+        conn.execute(schema_version.insert().values(version=VERSION_ESQUEMA + 1, descripcion="Futura"))
+
+    verificar_version_esquema(motor)
+
+
+def test_verificar_sin_aviso_de_esquema_mas_nuevo(motor, caplog):
+    aplicar_migraciones(motor)
+    with motor.begin() as conn:
+        conn.execute(schema_version.insert().values(version=VERSION_ESQUEMA + 1, descripcion="Futura"))
+
+    verificar_version_esquema(motor, avisar_si_mas_nuevo=False)
+    assert not caplog.records
+
+    verificar_version_esquema(motor)
+    assert "más nueva" in caplog.text